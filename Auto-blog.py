@@ -19,29 +19,61 @@ status: publish / draft / future
 """
 
 import os
-import re
+import math
 import time
 import shutil
+import hashlib
+import sqlite3
 import logging
+import queue
+import threading
 import requests
-import markdown
-import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse
 from dotenv import load_dotenv
-from watchdog.observers.polling import PollingObserver as Observer
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 
+try:
+    import fcntl  # 유닉스 전용 (파일 잠금 확인)
+except ImportError:
+    fcntl = None
+
 # .env 파일 로드
 load_dotenv()
 
+
+def _env_number(name, default, cast):
+    """숫자 설정 읽기. 형식이 잘못되면 None (validate_config에서 오류로 보고)"""
+    try:
+        value = cast(os.getenv(name, default))
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
 # ============ 설정 (.env에서 로드) ============
 WP_URL = os.getenv('WP_URL')
 WP_USER = os.getenv('WP_USER')
 WP_APP_PASSWORD = os.getenv('WP_APP_PASSWORD')
 WATCH_FOLDER = os.getenv('WATCH_FOLDER')
 PUBLISHED_FOLDER = os.getenv('PUBLISHED_FOLDER')
+# NFS/SMB 등 네트워크 드라이브는 OS 이벤트가 누락되므로 폴링 모드 사용
+USE_POLLING = os.getenv('USE_POLLING', '').lower() in ('1', 'true', 'yes')
+POLLING_INTERVAL = _env_number('POLLING_INTERVAL', '3', float)
+# 동시에 진행할 포스팅(API 요청) 수
+MAX_CONCURRENCY = _env_number('MAX_CONCURRENCY', '5', int)
+# 같은 파일의 연속 이벤트를 합치는 대기 시간 (초)
+DEBOUNCE_SECONDS = _env_number('DEBOUNCE_SECONDS', '0.3', float)
+# 포스팅할 마크다운 파일 최대 크기 (MB)
+MAX_MD_MB = _env_number('MAX_MD_MB', '5', float)
+MAX_MD_BYTES = int(MAX_MD_MB * 1024 * 1024) if MAX_MD_MB else 0
+# 처리 완료 기록 DB (재시작 시 중복 포스팅 방지)
+STATE_DB = os.getenv('STATE_DB', str(Path.home() / '.auto-blog' / 'processed.sqlite'))
 # =============================================
 
 # ============ 로깅 설정 ============
@@ -54,101 +86,358 @@ logger = logging.getLogger(__name__)
 # ===================================
 
 # ============ 전역 변수 ============
-# 처리된 파일 추적 (중복 방지)
+# 포스팅 완료된 파일 내용 지문 (중복 방지, 경로/파일명과 무관)
 processed_files = set()
+# 처리 완료 기록 DB 연결 (init_state_db에서 초기화)
+_state_db = None
+# WATCH_FOLDER와 PUBLISHED_FOLDER가 같은 파일시스템인지 (main에서 확인)
+_same_fs = False
+
+# WordPress API 세션 (keep-alive, 커넥션 재사용)
+# POST는 Retry 기본 allowed_methods에 없으므로 중복 포스팅 위험 없이 GET만 재시도
+SESSION = requests.Session()
+SESSION.auth = (WP_USER, WP_APP_PASSWORD)
+SESSION.headers.update({'Content-Type': 'application/json'})
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    # 포스팅 작업자마다 keep-alive 연결을 하나씩 유지 (초과 시 연결이 버려지고 재핸드셰이크)
+    pool_maxsize=max(8, MAX_CONCURRENCY or 0),
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+# 마크다운 변환기 (재사용)
+# markdown, yaml은 첫 파일 처리 시 불러옴 (시작 시간 단축)
+# Markdown 인스턴스는 스레드 안전하지 않으므로 잠금과 함께 사용
+_MD = None
+_MD_LOCK = threading.Lock()
+_yaml = None
+_YamlLoader = None
+
+# 카테고리 캐시 (이름 소문자 → ID)
+_category_cache = {'names': {}, 'fetched_at': 0}
+_CATEGORY_TTL = 300  # 초
+
+# 카테고리 사전 조회 시 프론트매터를 찾기 위해 읽는 최대 크기
+_FRONTMATTER_MAX_BYTES = 64 * 1024
 # ===================================
 
 
-def get_category_id(category_name):
-    """카테고리 이름으로 ID 찾기. 없으면 None 반환 (정확한 매칭)"""
-    if not category_name:
-        return None
-
+def fetch_categories():
+    """전체 카테고리 목록을 가져와 캐시 갱신. 실패 시 False 반환"""
     try:
-        # 모든 카테고리 가져오기 (정확한 매칭을 위해)
         api_url = f"{WP_URL}/wp-json/wp/v2/categories"
-        response = requests.get(
+        response = SESSION.get(
             api_url,
             params={'per_page': 100, 'orderby': 'name', 'order': 'asc'},
-            auth=(WP_USER, WP_APP_PASSWORD),
             timeout=10
         )
 
         if response.status_code == 200:
             categories = response.json()
-            category_name_lower = category_name.lower()
-            for cat in categories:
-                if cat['name'].lower() == category_name_lower:
-                    return cat['id']
+            _category_cache['names'] = {cat['name'].lower(): cat['id'] for cat in categories}
+            _category_cache['fetched_at'] = time.time()
+            return True
         else:
             logger.warning(f"카테고리 조회 실패: {response.status_code}")
     except requests.exceptions.RequestException as e:
         logger.error(f"카테고리 조회 중 네트워크 오류: {e}")
     except Exception as e:
         logger.error(f"카테고리 조회 중 오류: {e}")
-    
-    return None
+
+    return False
 
 
-def parse_frontmatter(content):
-    """마크다운에서 YAML 프론트매터 파싱"""
-    pattern = r'^---\s*\n(.*?)\n---\s*\n(.*)$'
-    match = re.match(pattern, content, re.DOTALL)
+def _load_markdown():
+    """Markdown 변환기 반환 (첫 호출 시 생성). 호출자가 _MD_LOCK을 잡고 있어야 함"""
+    global _MD
+    if _MD is None:
+        import markdown
+        _MD = markdown.Markdown(extensions=['fenced_code', 'tables', 'nl2br'])
+    return _MD
 
-    if match:
+
+def _load_yaml():
+    """yaml 모듈과 로더 반환 (첫 호출 시 import, libyaml C 확장 우선)"""
+    global _yaml, _YamlLoader
+    if _yaml is None:
+        import yaml
         try:
-            metadata = yaml.safe_load(match.group(1))
-            body = match.group(2)
-            return metadata or {}, body
-        except yaml.YAMLError:
-            return {}, content
-    return {}, content
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeLoader as loader
+        _YamlLoader = loader
+        _yaml = yaml
+    return _yaml, _YamlLoader
+
+
+def init_state_db():
+    """처리 완료 기록 DB를 열고 processed_files에 로드"""
+    global _state_db
+    try:
+        Path(STATE_DB).parent.mkdir(parents=True, exist_ok=True)
+        _state_db = sqlite3.connect(STATE_DB, check_same_thread=False)
+        _state_db.execute('PRAGMA journal_mode=WAL')
+        _state_db.execute('PRAGMA synchronous=NORMAL')
+        _state_db.execute(
+            'CREATE TABLE IF NOT EXISTS posted '
+            '(fingerprint TEXT PRIMARY KEY, path TEXT, posted_at REAL)'
+        )
+        _state_db.commit()
+        processed_files.update(row[0] for row in _state_db.execute('SELECT fingerprint FROM posted'))
+        logger.info(f"   처리 기록 {len(processed_files)}개 로드: {STATE_DB}")
+    except sqlite3.Error as e:
+        logger.error(f"처리 기록 DB 열기 실패 (메모리에만 기록): {STATE_DB} - {e}")
+        _state_db = None
+
+
+def file_fingerprint(content):
+    """파일 내용 지문 (blake2b). 같은 내용이면 이름이 달라도 같은 값"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def mark_processed(fingerprint, filepath_str):
+    """처리 완료 표시 (메모리 + DB). 호출자가 잠금을 잡고 있어야 함"""
+    processed_files.add(fingerprint)
+    if _state_db is None:
+        return
+    try:
+        _state_db.execute(
+            'INSERT OR IGNORE INTO posted(fingerprint, path, posted_at) VALUES(?, ?, ?)',
+            (fingerprint, filepath_str, time.time())
+        )
+        _state_db.commit()
+    except sqlite3.Error as e:
+        logger.error(f"처리 기록 저장 실패: {filepath_str} - {e}")
 
 
-def wait_for_file_ready(filepath, max_retries=10, retry_delay=0.5):
-    """파일이 완전히 쓰여졌는지 확인 (재시도 로직)"""
+def get_category_id(category_name):
+    """카테고리 이름으로 ID 찾기. 없으면 None 반환 (정확한 매칭)"""
+    if not category_name:
+        return None
+
+    category_name_lower = category_name.lower()
+
+    # 캐시가 유효하면 네트워크 요청 없이 조회
+    if time.time() - _category_cache['fetched_at'] < _CATEGORY_TTL:
+        category_id = _category_cache['names'].get(category_name_lower)
+        if category_id:
+            return category_id
+
+    # 캐시 만료 또는 미스 → 새로 추가된 카테고리일 수 있으므로 한 번 재조회
+    if fetch_categories():
+        return _category_cache['names'].get(category_name_lower)
+
+    return None
+
+
+def _find_frontmatter(data):
+    """프론트매터 YAML 구간 (시작, 끝) 위치 반환. 없으면 None
+
+    구분선('---' 뒤 공백만 있는 줄)을 bytes.find로 찾는 선형 탐색이라
+    닫는 구분선이 없는 큰 파일에서도 정규식 역추적이 일어나지 않음
+    """
+    # 여는 구분선
+    if not data.startswith(b'---'):
+        return None
+    newline = data.find(b'\n', 3)
+    if newline == -1 or data[3:newline].strip():
+        return None
+    fm_start = newline + 1
+
+    # 닫는 구분선
+    pos = newline
+    while True:
+        end = data.find(b'\n---', pos)
+        if end == -1:
+            return None
+        line_end = data.find(b'\n', end + 4)
+        if line_end != -1 and not data[end + 4:line_end].strip():
+            return fm_start, end
+        pos = end + 1
+
+
+def _load_frontmatter(data, fm_start, end):
+    """프론트매터 YAML 구간을 디코딩해 파싱. 형식 오류면 None, 매핑이 아니면 빈 dict"""
+    yaml, loader = _load_yaml()
+    try:
+        metadata = yaml.load(data[fm_start:end].decode('utf-8'), Loader=loader)
+    except yaml.YAMLError:
+        return None
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def parse_frontmatter(data):
+    """마크다운(bytes)에서 YAML 프론트매터 파싱. (메타데이터, 본문 문자열) 반환"""
+    bounds = _find_frontmatter(data)
+    if bounds is None:
+        return {}, data.decode('utf-8')
+    fm_start, end = bounds
+
+    metadata = _load_frontmatter(data, fm_start, end)
+    if metadata is None:
+        return {}, data.decode('utf-8')
+
+    # 구분선 뒤 공백 줄은 마지막 개행까지 건너뜀
+    pos = end + 4
+    while pos < len(data) and data[pos] in b' \t\r\n':
+        pos += 1
+    body_start = data.rfind(b'\n', end + 4, pos) + 1
+    return metadata, data[body_start:].decode('utf-8')
+
+
+def read_frontmatter(filepath):
+    """파일 앞부분만 읽어 프론트매터 메타데이터 반환 (본문은 읽거나 디코딩하지 않음)"""
+    with open(filepath, 'rb') as f:
+        data = f.read(_FRONTMATTER_MAX_BYTES)
+    bounds = _find_frontmatter(data)
+    if bounds is None:
+        return {}
+    return _load_frontmatter(data, *bounds) or {}
+
+
+def check_file_size(filepath, log=True):
+    """읽기 전에 크기로 빈 파일 / 과도하게 큰 파일 거르기. stat 실패 시 OSError 발생"""
     filepath = Path(filepath)
-    last_size = 0
-    
+    file_size = filepath.stat().st_size
+    if file_size == 0:
+        if log:
+            logger.warning(f"빈 파일 무시: {filepath.name}")
+        return False
+    if file_size > MAX_MD_BYTES:
+        if log:
+            logger.warning(
+                f"파일이 너무 큼 ({file_size} bytes > {MAX_MD_BYTES}): {filepath.name} (무시됨)"
+            )
+        return False
+    return True
+
+
+def _is_write_locked(filepath):
+    """다른 프로세스가 배타적 잠금(flock)을 잡고 있는지 확인 (fcntl 없으면 False)"""
+    if fcntl is None:
+        return False
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return False
+    except OSError:
+        return True
+    finally:
+        os.close(fd)
+
+
+def wait_for_file_ready(filepath, max_retries=8, initial_delay=0.05, max_delay=0.5):
+    """파일이 완전히 쓰여졌는지 확인 (지수 백오프 재시도)"""
+    filepath = Path(filepath)
+    delay = initial_delay
+
     for attempt in range(max_retries):
         try:
-            if not filepath.exists():
-                time.sleep(retry_delay)
-                continue
-            
-            current_size = filepath.stat().st_size
-            if current_size == last_size and current_size > 0:
-                # 파일 크기가 변하지 않으면 쓰기 완료로 간주
-                time.sleep(retry_delay)  # 마지막 안전 대기
-                return True
-            last_size = current_size
-            time.sleep(retry_delay)
+            if filepath.exists():
+                size_before = filepath.stat().st_size
+                time.sleep(delay)
+                size_after = filepath.stat().st_size
+                # 크기가 변하지 않고 쓰기 잠금도 없으면 쓰기 완료로 간주
+                if size_before == size_after > 0 and not _is_write_locked(filepath):
+                    return True
+            else:
+                time.sleep(delay)
         except (OSError, PermissionError) as e:
             logger.debug(f"파일 확인 중 오류 (시도 {attempt + 1}/{max_retries}): {e}")
-            time.sleep(retry_delay)
-    
+            time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
     return False
 
 
 class MarkdownHandler(FileSystemEventHandler):
+    """파일 이벤트를 받아 3단계 파이프라인으로 포스팅
+
+    준비(읽기/파싱/HTML 변환) → 전송(WordPress API) → 이동(published 폴더)
+    단계마다 작업자 스레드와 크기 제한 큐를 두어, 한 파일의 API 응답을 기다리는 동안
+    다음 파일의 변환과 이전 파일의 이동이 함께 진행됨
+    """
+
     def __init__(self):
         self.processing = set()  # 현재 처리 중인 파일 추적
-    
+        self.lock = threading.Lock()  # processed_files / processing 보호
+        self.in_flight = {}  # 처리 중 파일 경로 → 예약된 내용 지문 (같은 내용 동시 포스팅 방지)
+        self.category_map = {}  # 일괄 처리 시 미리 조회한 카테고리 (이름 소문자 → ID)
+        # 연속 이벤트 디바운스 타이머 (경로 → Timer)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+
+        # 단계별 큐 (크기 제한으로 앞 단계가 너무 앞서가지 않도록)
+        self.prepare_queue = queue.Queue(maxsize=MAX_CONCURRENCY * 2)
+        self.post_queue = queue.Queue(maxsize=MAX_CONCURRENCY * 2)
+        self.move_queue = queue.Queue(maxsize=MAX_CONCURRENCY * 2)
+
+        workers = [(self._prepare_worker, 1), (self._post_worker, MAX_CONCURRENCY), (self._move_worker, 1)]
+        for target, count in workers:
+            for _ in range(count):
+                threading.Thread(target=target, daemon=True).start()
+
+    def _schedule(self, src_path):
+        """짧은 시간 안에 반복되는 이벤트를 하나로 합쳐 처리 예약"""
+        with self._pending_lock:
+            timer = self._pending.get(src_path)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(DEBOUNCE_SECONDS, self._do_post, args=(src_path,))
+            timer.daemon = True
+            self._pending[src_path] = timer
+            timer.start()
+
+    def _do_post(self, src_path):
+        """디바운스 만료 시 쓰기 완료를 기다린 뒤 파이프라인에 전달 (타이머 스레드)"""
+        with self._pending_lock:
+            # 그 사이 새 타이머가 예약됐으면 그 타이머는 그대로 추적되도록 둠
+            if self._pending.get(src_path) is threading.current_thread():
+                del self._pending[src_path]
+        if not Path(src_path).exists():
+            return  # 그 사이 이동/삭제됨
+        if wait_for_file_ready(src_path):
+            self.post_to_wordpress(src_path)
+        else:
+            logger.warning(f"파일 준비 대기 시간 초과: {Path(src_path).name}")
+
+    def cancel_pending(self):
+        """종료 시 대기 중인 디바운스 타이머 취소"""
+        with self._pending_lock:
+            for timer in self._pending.values():
+                timer.cancel()
+            self._pending.clear()
+
+    def wait_idle(self):
+        """파이프라인에 들어간 파일이 모두 처리될 때까지 대기"""
+        self.prepare_queue.join()
+        self.post_queue.join()
+        self.move_queue.join()
+
+    def _release(self, filepath_str):
+        """파이프라인에서 빠져나온 파일을 처리 중 목록에서 제거 (지문 예약도 해제)"""
+        with self.lock:
+            self.processing.discard(filepath_str)
+            self.in_flight.pop(filepath_str, None)
+
     def on_created(self, event):
         if event.is_directory:
             return
         if event.src_path.endswith('.md'):
             filepath = Path(event.src_path)
-            # 중복 처리 방지
-            if str(filepath) in processed_files or str(filepath) in self.processing:
-                logger.debug(f"이미 처리된 파일 무시: {filepath.name}")
+            # 중복 처리 방지 (이미 포스팅한 내용인지는 파일을 읽은 뒤 지문으로 확인)
+            if str(filepath) in self.processing:
+                logger.debug(f"이미 처리 중인 파일 무시: {filepath.name}")
                 return
             
-            # 파일 쓰기 완료 대기
-            if wait_for_file_ready(filepath):
-                self.post_to_wordpress(event.src_path)
-            else:
-                logger.warning(f"파일 준비 대기 시간 초과: {filepath.name}")
+            # 파일 쓰기 완료 대기 후 포스팅
+            self._schedule(event.src_path)
     
     def on_modified(self, event):
         """파일 수정 시에도 처리 (선택적)"""
@@ -160,192 +449,290 @@ class MarkdownHandler(FileSystemEventHandler):
             if PUBLISHED_FOLDER and str(filepath).startswith(str(Path(PUBLISHED_FOLDER))):
                 return
             
-            # 이미 처리된 파일은 수정 시 재처리하지 않음 (중복 방지)
-            if str(filepath) in processed_files:
-                logger.debug(f"이미 처리된 파일 수정 무시: {filepath.name}")
-                return
-            
+            # 내용이 바뀌었으면 지문이 달라지므로 다시 포스팅, 같으면 준비 단계에서 무시
             if str(filepath) not in self.processing:
-                if wait_for_file_ready(filepath):
-                    self.post_to_wordpress(event.src_path)
+                self._schedule(event.src_path)
 
     def post_to_wordpress(self, filepath):
+        """파일을 포스팅 파이프라인에 넣기 (중복이면 무시)"""
         filepath = Path(filepath)
         filepath_str = str(filepath)
         
-        # 중복 처리 방지
-        if filepath_str in processed_files or filepath_str in self.processing:
-            logger.debug(f"이미 처리 중이거나 처리된 파일: {filepath.name}")
-            return
-        
-        self.processing.add(filepath_str)
+        # 중복 처리 방지 (확인과 등록을 원자적으로)
+        with self.lock:
+            if filepath_str in self.processing:
+                logger.debug(f"이미 처리 중인 파일: {filepath.name}")
+                return
+            self.processing.add(filepath_str)
         logger.info(f"📄 새 파일 감지: {filepath.name}")
+        self.prepare_queue.put(filepath)
 
-        try:
-            # 파일 읽기
+    def _prepare_worker(self):
+        """1단계: 파일 읽기, 프론트매터 파싱, 마크다운 → HTML 변환"""
+        while True:
+            filepath = self.prepare_queue.get()
+            job = None
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except FileNotFoundError:
-                logger.error(f"파일을 찾을 수 없음: {filepath}")
-                self.processing.discard(filepath_str)
-                return
-            except PermissionError:
-                logger.error(f"파일 읽기 권한 없음: {filepath}")
-                self.processing.discard(filepath_str)
-                return
+                job = self._prepare(filepath)
             except Exception as e:
-                logger.error(f"파일 읽기 오류: {filepath} - {e}")
-                self.processing.discard(filepath_str)
-                return
-
-            if not content.strip():
-                logger.warning(f"빈 파일 무시: {filepath.name}")
-                self.processing.discard(filepath_str)
-                return
-
-            # 프론트매터 파싱
+                logger.error(f"예상치 못한 오류 발생: {filepath.name} - {e}", exc_info=True)
+            finally:
+                if job:
+                    self.post_queue.put(job)
+                else:
+                    self._release(str(filepath))
+                self.prepare_queue.task_done()
+
+    def _prepare(self, filepath):
+        """포스팅 작업 데이터 생성. 포스팅할 수 없으면 None 반환"""
+        # 파일 읽기 (읽기 전에 크기로 빈 파일 / 과도하게 큰 파일 거르기)
+        try:
+            if not check_file_size(filepath):
+                return None
+            with open(filepath, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            logger.error(f"파일을 찾을 수 없음: {filepath}")
+            return None
+        except PermissionError:
+            logger.error(f"파일 읽기 권한 없음: {filepath}")
+            return None
+        except Exception as e:
+            logger.error(f"파일 읽기 오류: {filepath} - {e}")
+            return None
+
+        if not content or content.isspace():
+            logger.warning(f"빈 파일 무시: {filepath.name}")
+            return None
+
+        # 이미 포스팅한 내용이면 무시 (재시작, 다른 이름으로 다시 넣은 경우 포함)
+        # 확인과 예약을 원자적으로 해서 같은 내용이 동시에 들어와도 한 번만 포스팅
+        fingerprint = file_fingerprint(content)
+        with self.lock:
+            if fingerprint in processed_files or fingerprint in self.in_flight.values():
+                logger.info(f"이미 포스팅된 내용 무시: {filepath.name}")
+                return None
+            self.in_flight[str(filepath)] = fingerprint
+
+        # 프론트매터 파싱
+        try:
             metadata, body = parse_frontmatter(content)
-
-            # 제목: 메타데이터 > 첫 번째 # 헤더 > 파일명
-            title = metadata.get('title')
-            if not title:
-                lines = body.split('\n')
-                for line in lines:
-                    if line.startswith('# '):
-                        title = line[2:].strip()
-                        body = body.replace(line + '\n', '', 1)
-                        break
-            if not title:
-                title = filepath.stem
-
-            # 상태 (기본값: draft)
-            status = metadata.get('status', 'draft').lower()
-            if status not in ['publish', 'draft', 'future']:
-                status = 'draft'
-
-            # 날짜 처리
-            post_date = metadata.get('date')
-            date_str = None
-            if post_date:
-                if isinstance(post_date, datetime):
-                    date_str = post_date.strftime('%Y-%m-%dT%H:%M:%S')
-                elif isinstance(post_date, str):
+        except UnicodeDecodeError:
+            logger.error(f"파일 인코딩 오류 (UTF-8 아님): {filepath}")
+            return None
+
+        # 제목: 메타데이터 > 첫 번째 # 헤더 > 파일명
+        title = metadata.get('title')
+        if not title:
+            # 줄 목록을 만들지 않고 첫 '# ' 헤더 위치만 찾기 (대부분 첫 줄)
+            if body.startswith('# '):
+                start = 0
+            else:
+                start = body.find('\n# ')
+                if start != -1:
+                    start += 1
+            if start != -1:
+                end = body.find('\n', start)
+                if end == -1:
+                    end = len(body)
+                title = body[start + 2:end].strip()
+                body = body[:start] + body[end + 1:]
+        if not title:
+            title = filepath.stem
+
+        # 상태 (기본값: draft)
+        status = metadata.get('status', 'draft').lower()
+        if status not in ['publish', 'draft', 'future']:
+            status = 'draft'
+
+        # 날짜 처리
+        post_date = metadata.get('date')
+        date_str = None
+        if post_date:
+            if isinstance(post_date, datetime):
+                date_str = post_date.strftime('%Y-%m-%dT%H:%M:%S')
+            elif isinstance(post_date, str):
+                try:
+                    parsed = datetime.strptime(post_date, '%Y-%m-%d %H:%M')
+                    date_str = parsed.strftime('%Y-%m-%dT%H:%M:%S')
+                except ValueError:
                     try:
-                        parsed = datetime.strptime(post_date, '%Y-%m-%d %H:%M')
+                        parsed = datetime.strptime(post_date, '%Y-%m-%d')
                         date_str = parsed.strftime('%Y-%m-%dT%H:%M:%S')
                     except ValueError:
-                        try:
-                            parsed = datetime.strptime(post_date, '%Y-%m-%d')
-                            date_str = parsed.strftime('%Y-%m-%dT%H:%M:%S')
-                        except ValueError:
-                            logger.warning(f"날짜 형식 오류: {post_date} (무시됨)")
-
-            # 카테고리
-            category_name = metadata.get('category')
+                        logger.warning(f"날짜 형식 오류: {post_date} (무시됨)")
+
+        # 카테고리
+        category_name = metadata.get('category')
+        if category_name and str(category_name).lower() in self.category_map:
+            category_id = self.category_map[str(category_name).lower()]
+        else:
             category_id = get_category_id(category_name)
-            if category_name and not category_id:
-                logger.warning(f"카테고리 '{category_name}' 없음 → 미분류로 등록")
+        if category_name and not category_id:
+            logger.warning(f"카테고리 '{category_name}' 없음 → 미분류로 등록")
 
-            # 마크다운 → HTML 변환
+        # 마크다운 → HTML 변환
+        try:
+            with _MD_LOCK:
+                html_content = _load_markdown().reset().convert(body)
+        except Exception as e:
+            logger.error(f"마크다운 변환 오류: {e}")
+            return None
+
+        # WordPress API 요청 데이터
+        post_data = {
+            'title': title,
+            'content': html_content,
+            'status': status
+        }
+
+        if date_str:
+            post_data['date'] = date_str
+
+        if category_id:
+            post_data['categories'] = [category_id]
+
+        return {
+            'filepath': filepath,
+            'fingerprint': fingerprint,
+            'post_data': post_data,
+            'category_name': category_name if category_id else None,
+        }
+
+    def _post_worker(self):
+        """2단계: WordPress API 호출"""
+        while True:
+            job = self.post_queue.get()
+            posted = False
             try:
-                html_content = markdown.markdown(
-                    body,
-                    extensions=['fenced_code', 'tables', 'nl2br']
-                )
+                posted = self._post(job)
             except Exception as e:
-                logger.error(f"마크다운 변환 오류: {e}")
-                self.processing.discard(filepath_str)
-                return
-
-            # WordPress API 요청 데이터
-            post_data = {
-                'title': title,
-                'content': html_content,
-                'status': status
-            }
-
-            if date_str:
-                post_data['date'] = date_str
+                logger.error(f"예상치 못한 오류 발생: {job['filepath'].name} - {e}", exc_info=True)
+            finally:
+                if posted:
+                    self.move_queue.put(job['filepath'])
+                else:
+                    self._release(str(job['filepath']))
+                self.post_queue.task_done()
+
+    def _post(self, job):
+        """포스팅 요청. 성공하면 처리 완료로 기록하고 True 반환"""
+        filepath = job['filepath']
+        post_data = job['post_data']
+        status = post_data['status']
+
+        # WordPress API 호출
+        api_url = f"{WP_URL}/wp-json/wp/v2/posts"
 
-            if category_id:
-                post_data['categories'] = [category_id]
+        try:
+            response = SESSION.post(
+                api_url,
+                json=post_data,
+                timeout=30
+            )
+        except requests.exceptions.Timeout:
+            logger.error(f"API 요청 시간 초과: {filepath.name}")
+            return False
+        except requests.exceptions.ConnectionError:
+            logger.error(f"네트워크 연결 오류: {filepath.name}")
+            return False
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API 요청 오류: {filepath.name} - {e}")
+            return False
 
-            # WordPress API 호출
-            api_url = f"{WP_URL}/wp-json/wp/v2/posts"
+        if response.status_code != 201:
+            logger.error(f"❌ 포스팅 실패: {response.status_code}")
+            try:
+                error_data = response.json()
+                error_msg = error_data.get('message', response.text)
+                logger.error(f"   에러: {error_msg}")
+            except:
+                logger.error(f"   에러: {response.text}")
+            return False
 
+        post_response = response.json()
+        post_url = post_response.get('link', '')
+
+        status_msg = {
+            'publish': '발행완료',
+            'draft': '임시저장',
+            'future': '예약발행'
+        }.get(status, status)
+
+        logger.info(f"✅ 포스팅 성공! ({status_msg})")
+        logger.info(f"   제목: {post_data['title']}")
+        if job['category_name']:
+            logger.info(f"   카테고리: {job['category_name']}")
+        if 'date' in post_data and status == 'future':
+            logger.info(f"   예약시간: {post_data['date']}")
+        logger.info(f"   URL: {post_url}")
+
+        # 포스팅은 성공했으므로 이동 결과와 관계없이 처리 완료로 표시
+        with self.lock:
+            mark_processed(job['fingerprint'], str(filepath))
+        return True
+
+    def _move_worker(self):
+        """3단계: published 폴더로 이동"""
+        while True:
+            filepath = self.move_queue.get()
             try:
-                response = requests.post(
-                    api_url,
-                    auth=(WP_USER, WP_APP_PASSWORD),
-                    json=post_data,
-                    timeout=30
-                )
-            except requests.exceptions.Timeout:
-                logger.error(f"API 요청 시간 초과: {filepath.name}")
-                self.processing.discard(filepath_str)
-                return
-            except requests.exceptions.ConnectionError:
-                logger.error(f"네트워크 연결 오류: {filepath.name}")
-                self.processing.discard(filepath_str)
-                return
-            except requests.exceptions.RequestException as e:
-                logger.error(f"API 요청 오류: {filepath.name} - {e}")
-                self.processing.discard(filepath_str)
-                return
+                self._move(filepath)
+            except Exception as e:
+                logger.error(f"예상치 못한 오류 발생: {filepath.name} - {e}", exc_info=True)
+            finally:
+                self._release(str(filepath))
+                self.move_queue.task_done()
+
+    def _move(self, filepath):
+        """포스팅된 파일을 published 폴더로 이동"""
+        dest = Path(PUBLISHED_FOLDER) / filepath.name
+        try:
+            os.makedirs(PUBLISHED_FOLDER, exist_ok=True)
+            backup_name = f"{dest.stem}_{int(time.time())}{dest.suffix}"
+            backup_path = dest.parent / backup_name
 
-            if response.status_code == 201:
-                post_response = response.json()
-                post_url = post_response.get('link', '')
-
-                status_msg = {
-                    'publish': '발행완료',
-                    'draft': '임시저장',
-                    'future': '예약발행'
-                }.get(status, status)
-
-                logger.info(f"✅ 포스팅 성공! ({status_msg})")
-                logger.info(f"   제목: {title}")
-                if category_name and category_id:
-                    logger.info(f"   카테고리: {category_name}")
-                if date_str and status == 'future':
-                    logger.info(f"   예약시간: {date_str}")
-                logger.info(f"   URL: {post_url}")
-
-                # published 폴더로 이동
+            if _same_fs:
+                # 같은 파일시스템: 기존 파일은 하드링크로 백업하고 os.replace로 원자적 덮어쓰기
                 try:
-                    os.makedirs(PUBLISHED_FOLDER, exist_ok=True)
-                    dest = Path(PUBLISHED_FOLDER) / filepath.name
-                    
-                    # 목적지에 같은 이름의 파일이 있으면 백업
-                    if dest.exists():
-                        backup_name = f"{dest.stem}_{int(time.time())}{dest.suffix}"
-                        backup_path = dest.parent / backup_name
-                        shutil.move(str(dest), str(backup_path))
-                        logger.info(f"   기존 파일 백업: {backup_name}")
-                    
-                    shutil.move(str(filepath), str(dest))
-                    logger.info(f"   파일 이동: {dest}")
-                    
-                    # 처리 완료 표시
-                    processed_files.add(filepath_str)
-                except (OSError, PermissionError, shutil.Error) as e:
-                    logger.error(f"파일 이동 실패: {filepath} → {dest} - {e}")
-                    # 포스팅은 성공했으므로 처리 완료로 표시
-                    processed_files.add(filepath_str)
+                    os.link(dest, backup_path)
+                    logger.info(f"   기존 파일 백업: {backup_name}")
+                except FileNotFoundError:
+                    pass
+                except OSError:
+                    # 하드링크 미지원 파일시스템
+                    os.replace(dest, backup_path)
+                    logger.info(f"   기존 파일 백업: {backup_name}")
+                os.replace(filepath, dest)
             else:
-                logger.error(f"❌ 포스팅 실패: {response.status_code}")
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get('message', response.text)
-                    logger.error(f"   에러: {error_msg}")
-                except:
-                    logger.error(f"   에러: {response.text}")
-        
+                # 목적지에 같은 이름의 파일이 있으면 백업
+                if dest.exists():
+                    shutil.move(str(dest), str(backup_path))
+                    logger.info(f"   기존 파일 백업: {backup_name}")
+                shutil.move(str(filepath), str(dest))
+            logger.info(f"   파일 이동: {dest}")
+        except (OSError, PermissionError, shutil.Error) as e:
+            logger.error(f"파일 이동 실패: {filepath} → {dest} - {e}")
+
+
+def resolve_categories(filepaths):
+    """여러 파일의 카테고리를 한 번의 API 호출로 미리 조회"""
+    names = set()
+    for filepath in filepaths:
+        try:
+            if not check_file_size(filepath, log=False):
+                continue  # 준비 단계에서 경고 후 무시됨
+            metadata = read_frontmatter(filepath)
         except Exception as e:
-            logger.error(f"예상치 못한 오류 발생: {filepath.name} - {e}", exc_info=True)
-        finally:
-            self.processing.discard(filepath_str)
+            logger.debug(f"카테고리 사전 조회 중 파일 읽기 실패: {filepath} - {e}")
+            continue
+        category_name = metadata.get('category')
+        if category_name:
+            names.add(str(category_name).lower())
+
+    if not names or not fetch_categories():
+        return {}
+    return {name: _category_cache['names'].get(name) for name in names}
 
 
 def process_existing_files(handler):
@@ -354,8 +741,14 @@ def process_existing_files(handler):
         existing_files = list(Path(WATCH_FOLDER).glob('*.md'))
         if existing_files:
             logger.info(f"\n📂 기존 파일 {len(existing_files)}개 발견")
-            for filepath in existing_files:
-                handler.post_to_wordpress(str(filepath))
+            handler.category_map = resolve_categories(existing_files)
+            try:
+                for filepath in existing_files:
+                    handler.post_to_wordpress(str(filepath))
+                handler.wait_idle()
+            finally:
+                # 이후 감시 이벤트는 TTL 캐시를 통해 조회
+                handler.category_map = {}
     except Exception as e:
         logger.error(f"기존 파일 처리 중 오류: {e}")
 
@@ -405,6 +798,16 @@ def validate_config():
         except Exception as e:
             errors.append(f"PUBLISHED_FOLDER 생성/접근 실패: {PUBLISHED_FOLDER} - {e}")
     
+    # 숫자 설정 확인
+    if MAX_CONCURRENCY is None or MAX_CONCURRENCY < 1:
+        errors.append("MAX_CONCURRENCY는 1 이상의 정수여야 합니다")
+    if POLLING_INTERVAL is None or POLLING_INTERVAL <= 0:
+        errors.append("POLLING_INTERVAL은 0보다 큰 숫자여야 합니다")
+    if DEBOUNCE_SECONDS is None or DEBOUNCE_SECONDS < 0:
+        errors.append("DEBOUNCE_SECONDS는 0 이상의 숫자여야 합니다")
+    if MAX_MD_MB is None or MAX_MD_MB <= 0:
+        errors.append("MAX_MD_MB는 0보다 큰 숫자여야 합니다")
+
     # WATCH_FOLDER와 PUBLISHED_FOLDER가 같으면 안 됨
     if WATCH_FOLDER and PUBLISHED_FOLDER:
         if Path(WATCH_FOLDER).resolve() == Path(PUBLISHED_FOLDER).resolve():
@@ -413,13 +816,20 @@ def validate_config():
     return errors
 
 
+def is_same_filesystem(path_a, path_b):
+    """두 경로가 같은 파일시스템(장치)에 있는지 확인"""
+    try:
+        return Path(path_a).resolve().stat().st_dev == Path(path_b).resolve().stat().st_dev
+    except OSError:
+        return False
+
+
 def test_wordpress_connection():
     """WordPress 연결 테스트"""
     try:
         api_url = f"{WP_URL}/wp-json/wp/v2/posts"
-        response = requests.get(
+        response = SESSION.get(
             api_url,
-            auth=(WP_USER, WP_APP_PASSWORD),
             params={'per_page': 1},
             timeout=10
         )
@@ -446,6 +856,9 @@ def main():
             logger.error(f"   - {error}")
         return
 
+    global _same_fs
+    _same_fs = is_same_filesystem(WATCH_FOLDER, PUBLISHED_FOLDER)
+
     # WordPress 연결 테스트
     if not test_wordpress_connection():
         logger.warning("⚠️  WordPress 연결에 문제가 있습니다. 계속 진행합니다...")
@@ -465,12 +878,17 @@ def main():
     logger.info("   ---")
     logger.info("=" * 50)
 
+    init_state_db()
     event_handler = MarkdownHandler()
 
     # 기존 파일 먼저 처리
     process_existing_files(event_handler)
 
-    observer = Observer()
+    if USE_POLLING:
+        observer = PollingObserver(timeout=POLLING_INTERVAL)
+        logger.info(f"   감시 방식: 폴링 ({POLLING_INTERVAL}초 간격)")
+    else:
+        observer = Observer()
     try:
         observer.schedule(event_handler, WATCH_FOLDER, recursive=False)
         observer.start()
@@ -486,6 +904,10 @@ def main():
     finally:
         observer.stop()
         observer.join()
+        event_handler.cancel_pending()
+        event_handler.wait_idle()
+        if _state_db is not None:
+            _state_db.close()
         logger.info("종료 완료")
 
 